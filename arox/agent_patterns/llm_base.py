@@ -1,4 +1,7 @@
+import asyncio
+import copy
 import logging
+import re
 import uuid
 from pathlib import Path
 
@@ -12,6 +15,8 @@ from arox.agent_patterns.state import SimpleState
 
 logger = logging.getLogger(__name__)
 
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
 
 class LLMBaseAgent:
     def __init__(
@@ -66,7 +71,10 @@ class LLMBaseAgent:
         model_config = getattr(config.model, self.model_ref)
 
         model_params = model_config.params
-        self.model_params = utils.deep_merge(self.agent_model_params, model_params)
+        # Merge into a copy, agent_model_params is shared with the parsed config.
+        self.model_params = utils.deep_merge(
+            copy.deepcopy(self.agent_model_params), model_params
+        )
         self.provider_model = model_config.provider_model
         return config
 
@@ -110,21 +118,36 @@ class LLMBaseAgent:
                     {
                         "prompt": v,
                         "pattern": pattern,
+                        "compiled": re.compile(pattern),
+                        # Literal patterns are matched with a substring check.
+                        "plain": _REGEX_META.isdisjoint(pattern),
                     }
                 )
 
         config = self.set_model(self.model_ref)
         return config
 
+    async def _run_hooks(self, hooks, input_content: str):
+        """Run hooks concurrently, with sequential hooks acting as barriers."""
+        batch = []
+        for hook, sequential in hooks:
+            if not sequential:
+                batch.append(hook(self, input_content))
+                continue
+            if batch:
+                await asyncio.gather(*batch)
+                batch = []
+            await hook(self, input_content)
+        if batch:
+            await asyncio.gather(*batch)
+
     async def _run_before_hooks(self, input_content: str):
         if hasattr(self, "before_step_hooks"):
-            for hook in self.before_step_hooks:
-                await hook(self, input_content)
+            await self._run_hooks(self.before_step_hooks, input_content)
 
     async def _run_after_hooks(self, input_content: str):
         if hasattr(self, "after_step_hooks"):
-            for hook in self.after_step_hooks:
-                await hook(self, input_content)
+            await self._run_hooks(self.after_step_hooks, input_content)
 
     async def step(self, input_content: str):
         await self._run_before_hooks(input_content)
@@ -144,12 +167,20 @@ class LLMBaseAgent:
     def last_message(self):
         return self.state.last_message()
 
-    def add_before_step_hook(self, hook):
+    def add_before_step_hook(self, hook, sequential=False):
+        """Hooks run concurrently with each other unless `sequential` is set,
+        in which case the hook waits for all hooks added before it and runs
+        before any hook added after it.
+
+        Unlike when all hooks ran one after another, an exception in a
+        concurrent hook does not stop the hooks running alongside it. The
+        exception is raised right away and later hooks are skipped."""
         if not hasattr(self, "before_step_hooks"):
             self.before_step_hooks = []
-        self.before_step_hooks.append(hook)
+        self.before_step_hooks.append((hook, sequential))
 
-    def add_after_step_hook(self, hook):
+    def add_after_step_hook(self, hook, sequential=False):
+        """See `add_before_step_hook`."""
         if not hasattr(self, "after_step_hooks"):
             self.after_step_hooks = []
-        self.after_step_hooks.append(hook)
+        self.after_step_hooks.append((hook, sequential))
@@ -1,12 +1,13 @@
+import asyncio
 import logging
-import re
+import os
 from pathlib import Path
 
 from kissllm.client import State
 from kissllm.io import IOTypeEnum
 from kissllm.stream import CompletionStream
 
-from arox.utils import xml_wrap
+from arox.utils import coalesce_chunks, xml_wrap
 
 logger = logging.getLogger(__name__)
 
@@ -14,20 +15,32 @@ logger = logging.getLogger(__name__)
 class ChatFiles:
     def __init__(self, agent, workspace) -> None:
         self.agent = agent
-        self._chat_files = []
-        self._pending_files = []
+        # Lists keep insertion order, sets back the membership checks.
+        self._chat_files: list[Path] = []
+        # Resolved against the workspace, parallel to self._chat_files.
+        self._abs_paths: list[Path] = []
+        self._chat_files_set: set[Path] = set()
+        self._pending_files: list[Path] = []
+        self._pending_files_set: set[Path] = set()
         self.candidate_generator = None
         self.workspace = workspace
+        # Absolute workspace with a trailing separator, for prefix checks.
+        self._ws_prefix = os.path.join(os.path.abspath(workspace), "")
+        # path -> (st_mtime_ns, st_size, content)
+        self._content_cache: dict[Path, tuple[int, int, str]] = {}
+        # (name, st_mtime_ns, st_size) of the files in the last read_files().
+        self.signature: tuple = ()
 
     def normalize(self, path: str) -> Path:
-        workspace = self.workspace
         # normalize file path to relative to workspace if it's subtree of workspace, otherwise absolute.
-        p = Path(path)
-        if not p.is_absolute():
-            p = (workspace / p).absolute()
-        if p.is_relative_to(workspace):
-            p = p.relative_to(workspace)
-        return p
+        # Works on strings since this runs for every completion candidate.
+        ws_prefix = self._ws_prefix
+        p = os.path.normpath(os.path.join(ws_prefix, path))
+        if p.startswith(ws_prefix):
+            return Path(p[len(ws_prefix) :])
+        if p + os.sep == ws_prefix:
+            return Path(".")
+        return Path(p)
 
     def add_by_names(self, paths: list[str]):
         succeed = []
@@ -42,31 +55,42 @@ class ChatFiles:
         return {"succeed": succeed, "not_exist": not_exist}
 
     def add(self, f: Path):
-        if f not in self._chat_files:
+        if f not in self._chat_files_set:
             self._chat_files.append(f)
-        if f not in self._pending_files:
+            self._abs_paths.append(f if f.is_absolute() else self.workspace / f)
+            self._chat_files_set.add(f)
+        if f not in self._pending_files_set:
             self._pending_files.append(f)
+            self._pending_files_set.add(f)
 
     async def remove(self, f: Path):
-        if f in self._chat_files:
-            self._chat_files.remove(f)
+        if f in self._chat_files_set:
+            idx = self._chat_files.index(f)
+            del self._chat_files[idx]
+            self._content_cache.pop(self._abs_paths.pop(idx), None)
+            self._chat_files_set.discard(f)
         else:
             await self.agent.io_channel.write(
                 f"{f} is not in chat file list, ignoring."
             )
 
-        if f in self._pending_files:
+        if f in self._pending_files_set:
             self._pending_files.remove(f)
+            self._pending_files_set.discard(f)
 
     def clear(self):
-        self._pending_files.clear()
+        self.clear_pending()
         self._chat_files.clear()
+        self._abs_paths.clear()
+        self._chat_files_set.clear()
+        self._content_cache.clear()
 
     def have_pending(self):
-        return bool(self._pending_files)
+        return bool(self._pending_files_set)
 
     def clear_pending(self):
         self._pending_files.clear()
+        self._pending_files_set.clear()
 
     def list(self):
         return self._chat_files
@@ -79,29 +103,44 @@ class ChatFiles:
             return []
         return self.candidate_generator()
 
+    def _read_cached(self, p: Path) -> str:
+        st = p.stat()
+        cached = self._content_cache.get(p)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        content = p.read_text(errors="replace")
+        self._content_cache[p] = (st.st_mtime_ns, st.st_size, content)
+        return content
+
     async def read_files(self):
-        file_content = ""
+        parts = []
         fpaths = []
+        signature = []
         if not self._chat_files:
+            self.signature = ()
             return "", []
 
         # This is intended to check self._pending_files but add self._chat_files.
-        for fname in self._chat_files:
-            p = fname if fname.is_absolute() else self.workspace / fname
-            try:
-                with open(p, "r") as f:
-                    content = f.read()
-                    fpaths.append(fname)
-                    logger.debug(f"Adding content from {fname}")
-                    file_content = (
-                        f"\n====FILE: {fname}====\n{content}\n\n{file_content}"
-                    )
-            except FileNotFoundError:
+        paths = self._abs_paths
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(self._read_cached, p) for p in paths),
+            return_exceptions=True,
+        )
+        for fname, p, content in zip(self._chat_files, paths, contents):
+            if isinstance(content, FileNotFoundError):
                 await self.agent.io_channel.write(f"File not found: {p}")
                 continue
-
+            if isinstance(content, BaseException):
+                raise content
+            fpaths.append(fname)
+            signature.append((fname, *self._content_cache[p][:2]))
+            logger.debug(f"Adding content from {fname}")
+            parts.append(f"\n====FILE: {fname}====\n{content}\n\n")
+
+        self.signature = tuple(signature)
         self.clear_pending()
-        return file_content, fpaths
+        # Later files are placed first, as before.
+        return "".join(reversed(parts)), fpaths
 
 
 class SimpleState(State):
@@ -136,19 +175,61 @@ class SimpleState(State):
         return items
 
     def _append_with_typ_meta(self, messages: list, typ, content):
-        """Remove message with type `typ` and append new content."""
-        replaced = list(
-            filter(
-                lambda msg: msg.get("local_metadata", {}).get("type") == typ, messages
-            )
-        )
-        for r in replaced:
-            messages.remove(r)
+        """Remove message with type `typ` and append new content.
+
+        An unchanged files message is left in place, other types always move
+        to the end.
+        """
+        content_hash = hash(content)
+        idx = self._find_typ(messages, typ)
+        if idx is not None:
+            msg = messages[idx]
+            if (
+                typ == "files"
+                and msg["local_metadata"].get("content_hash") == content_hash
+                and msg["content"] == content
+            ):
+                self._typ_index[typ] = idx
+                return
+            del messages[idx]
+            for t, i in self._typ_index.items():
+                if i > idx:
+                    self._typ_index[t] = i - 1
 
         if content:
             messages.append(
-                {"role": "user", "content": content, "local_metadata": {"type": typ}}
+                {
+                    "role": "user",
+                    "content": content,
+                    "local_metadata": {"type": typ, "content_hash": content_hash},
+                }
             )
+            self._typ_index[typ] = len(messages) - 1
+
+    def _find_typ(self, messages: list, typ):
+        """Pop the recorded index of the message with type `typ`, checking it
+        is still accurate since messages may be inserted by other code."""
+        idx = self._typ_index.pop(typ, None)
+        if idx is None:
+            return None
+        if (
+            idx < len(messages)
+            and messages[idx].get("local_metadata", {}).get("type") == typ
+        ):
+            return idx
+        for i, msg in enumerate(messages):
+            if msg.get("local_metadata", {}).get("type") == typ:
+                return i
+        return None
+
+    def _wrap_files(self, item):
+        """Wrap the files blob, reusing the last result if no file changed."""
+        signature = self.chat_files.signature
+        if self._files_xml and self._files_xml[0] == signature:
+            return self._files_xml[1]
+        content = xml_wrap([item])
+        self._files_xml = (signature, content)
+        return content
 
     async def add_user_input(self, user_input: str):
         return await self._assemble_prompt(user_input)
@@ -161,16 +242,23 @@ class SimpleState(State):
             if item[0] == "system":
                 messages.append({"role": "system", "content": item[1]})
                 continue
-            content = xml_wrap([item])
             # remove all outdated file contents and append updated.
             if item[0] == "files":
+                content = self._wrap_files(item)
                 self._append_with_typ_meta(messages, "files", content)
-            elif content:
+                continue
+            content = xml_wrap([item])
+            if content:
                 messages.append({"role": "user", "content": content})
 
         # Append model specific prompt to messages
+        model_ref = self.agent.model_ref
         for model_prompt in self.agent.model_prompt:
-            if re.search(model_prompt["pattern"], self.agent.model_ref):
+            if model_prompt["plain"]:
+                matched = model_prompt["pattern"] in model_ref
+            else:
+                matched = model_prompt["compiled"].search(model_ref)
+            if matched:
                 self._append_with_typ_meta(
                     messages, "model_prompt", model_prompt["prompt"]
                 )
@@ -183,6 +271,10 @@ class SimpleState(State):
 
     def reset(self):
         self._messages = []
+        # message type -> index in self._messages, see _append_with_typ_meta
+        self._typ_index: dict[str, int] = {}
+        # (chat_files.signature, wrapped files blob), see _wrap_files
+        self._files_xml = None
         self.message_meta = {}
         self.chat_files.clear()
 
@@ -190,7 +282,7 @@ class SimpleState(State):
         if isinstance(response, CompletionStream):
             io_channel = self.agent.io_channel
             channel = io_channel.create_sub_channel(IOTypeEnum.streaming_assistant)
-            await channel.write(response.iter_content())
+            await channel.write(coalesce_chunks(response.iter_content()))
 
         return await super().accumulate_response(response)
 
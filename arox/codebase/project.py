@@ -1,6 +1,6 @@
+import asyncio
 import logging
-
-import git
+import subprocess
 
 logger = logging.getLogger(__name__)
 
@@ -9,12 +9,43 @@ class ProjectManager:
     def __init__(self, worksapce, agent):
         self.workspace = worksapce
         self.agent = agent
+        self._tracked_cache = None
+        self._index_mtime = None
+        # Bumped every time the tracked files list is recomputed.
+        self.version = 0
+
+    def _index_signature(self):
+        # git rewrites .git/index whenever the set of tracked files changes.
+        try:
+            return (self.workspace / ".git" / "index").stat().st_mtime_ns
+        except OSError:
+            return None
 
     def get_tracked_files(self):
+        mtime = self._index_signature()
+        if mtime is not None and mtime == self._index_mtime:
+            return self._tracked_cache
+
         try:
-            repo = git.Repo(self.workspace)
-            tracked_files = repo.git.ls_files().splitlines()
-            return sorted(tracked_files)
-        except (git.InvalidGitRepositoryError, git.GitCommandError) as e:
+            result = subprocess.run(
+                ["git", "ls-files", "-z"],
+                cwd=self.workspace,
+                capture_output=True,
+                # Names are raw bytes, keep undecodable ones as valid paths.
+                encoding="utf-8",
+                errors="surrogateescape",
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
             logger.debug(f"Failed to get git tracked files: {e}")
-            return []
+            return ()
+
+        tracked_files = result.stdout.split("\0")[:-1]
+        self._tracked_cache = tuple(sorted(tracked_files))
+        self._index_mtime = mtime
+        self.version += 1
+        return self._tracked_cache
+
+    async def get_tracked_files_async(self):
+        """Same as `get_tracked_files`, without blocking the event loop on git."""
+        return await asyncio.to_thread(self.get_tracked_files)
@@ -13,10 +13,8 @@ def parse_cmdline(cmdline):
     if not cmdline.startswith("/"):
         return None, None
 
-    cmd = cmdline.split(" ", 1)
-    c_name = cmd[0][1:]
-    c_arg = cmd[1] if len(cmd) > 1 else None
-    return c_name, c_arg
+    head, sep, tail = cmdline.partition(" ")
+    return head[1:], (tail if sep else None)
 
 
 class CommandCompleter(Completer):
@@ -33,12 +31,10 @@ class CommandCompleter(Completer):
         if not name:
             return
         if args is None:  # Complete command names
-            candidates = self.command_manager.command_names()
-            for candidate in candidates:
-                if name in candidate:
-                    yield Completion(
-                        candidate, start_position=-len(name), display=candidate
-                    )
+            for candidate in self.command_manager.command_trie.prefix_iter(name):
+                yield Completion(
+                    candidate, start_position=-len(name), display=candidate
+                )
             return
 
         yield from self.command_manager.get_completions(name, args)
@@ -104,11 +100,13 @@ class FileCommand(Command):
                 current_word = parts[-1] if parts else ""
 
         if name == "add":
+            # The tracked files list is cached upstream, a plain scan over it
+            # is cheap and needs no index to keep up to date.
             candidates = self.agent.state.chat_files.candidates()
         elif name == "drop":
             candidates = [str(f) for f in self.agent.state.chat_files.list()]
         else:
-            candidates = []
+            return
 
         # Filter candidates based on current word
         for candidate in candidates:
@@ -171,7 +169,7 @@ class InvokeToolCommand(Command):
     async def execute(self, name: str, arg: str):
         tool_registry = self.agent.tool_registry
 
-        parts = arg.split(maxsplit=1)
+        parts = (arg or "").split(maxsplit=1)
         if len(parts) < 1:
             await self.agent.io_channel.write(
                 "Usage: /invoke-tool <function_name> [json_args]"
@@ -179,7 +177,7 @@ class InvokeToolCommand(Command):
             return
 
         function_name = parts[0]
-        args_str = parts[0] if len(parts) > 1 else "{}"
+        args_str = parts[1] if len(parts) > 1 else "{}"
 
         try:
             args = json.loads(args_str)
@@ -0,0 +1,42 @@
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.values: list = []
+
+
+class Trie:
+    """Minimal prefix tree mapping string keys to values."""
+
+    def __init__(self):
+        self._root = _Node()
+
+    def insert(self, key: str, value=None):
+        node = self._root
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _Node()
+            node = child
+        node.values.append(key if value is None else value)
+
+    def prefix_iter(self, prefix: str):
+        """Yield values whose key starts with `prefix`, in key order, each once."""
+        node = self._root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return
+
+        seen = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for value in node.values:
+                if value not in seen:
+                    seen.add(value)
+                    yield value
+            stack.extend(
+                node.children[ch] for ch in sorted(node.children, reverse=True)
+            )
@@ -1,17 +1,21 @@
 import asyncio
 
 from . import Command, CommandCompleter, parse_cmdline
+from ._trie import Trie
 
 
 class CommandManager:
     def __init__(self, agent):
         self.command_map = {}
+        self.command_trie = Trie()
         self.agent = agent
         self.completer = CommandCompleter(self.agent)
 
     def register_commands(self, commands: list[Command]):
         for command in commands:
             for s in command.slashes():
+                if s not in self.command_map:
+                    self.command_trie.insert(s)
                 self.command_map[s] = command
 
     async def try_execute_command(self, user_input: str) -> bool:
@@ -107,8 +107,9 @@ class CoderComposer:
             co_author = f"arox-coder/{agent.provider_model}"
             await self.commit_agent.auto_commit_changes(co_author=co_author)
 
-        self.coder_agent.add_before_step_hook(before_llm_hook)
-        self.coder_agent.add_after_step_hook(after_llm_hook)
+        # Commits touch the git index, keep them ordered against other hooks.
+        self.coder_agent.add_before_step_hook(before_llm_hook, sequential=True)
+        self.coder_agent.add_after_step_hook(after_llm_hook, sequential=True)
 
         if args.dump_default_config:
             logger.debug(f"Dumping default config to {args.dump_default_config}")
@@ -16,6 +16,15 @@ class CoderState(SimpleState):
         super().__init__(agent, use_flexible_toolcall, tool_registry)
         self.project_manager = project.ProjectManager(self.workspace, agent)
         self.chat_files.set_candidate_generator(self.project_manager.get_tracked_files)
+        # (tracked files version, joined file list)
+        self._file_list_cache = None
+
+    async def _compute_file_list(self) -> str:
+        tracked_files = await self.project_manager.get_tracked_files_async()
+        version = self.project_manager.version
+        if self._file_list_cache is None or self._file_list_cache[0] != version:
+            self._file_list_cache = (version, "\n".join(tracked_files))
+        return self._file_list_cache[1]
 
     async def _get_message_items(self, user_input):
         items = await super()._get_message_items(user_input)
@@ -24,7 +33,7 @@ class CoderState(SimpleState):
         else:
             insert_index = 0
         if not self.message_meta.get("file_list"):
-            file_list = "\n".join(self.project_manager.get_tracked_files())
+            file_list = await self._compute_file_list()
             items.insert(insert_index, ("file_list", file_list))
             self.message_meta["file_list"] = True
         return items
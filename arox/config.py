@@ -1,9 +1,55 @@
+import copy
+import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import tomli
 
-from arox.utils import deep_merge
+_BOOL_MAP = {"true": True, "false": False}
+_SIGNS = ("-", "+")
+# What int() and float() accept: surrounding whitespace, underscores between
+# digits, and nan/inf for floats.
+_DIGITS = r"\d++(?:_\d++)*+"
+_INT_RE = re.compile(rf"\s*+[-+]?+{_DIGITS}\s*+")
+_FLOAT_RE = re.compile(
+    rf"\s*+[-+]?+(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})"
+    rf"(?:e[-+]?{_DIGITS})?|inf(?:inity)?|nan)\s*+",
+    re.IGNORECASE,
+)
+
+# path -> (st_mtime_ns, st_size, parsed toml)
+_TOML_CACHE: dict[Path, tuple[int, int, dict]] = {}
+
+
+def _load_toml_cached(path: Path) -> dict:
+    """Load a TOML file, reusing the parsed result while the file is unchanged.
+
+    A deep copy is returned since merged configs are mutated by callers.
+    """
+    st = path.stat()
+    cached = _TOML_CACHE.get(path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        with open(path, "rb") as f:
+            cached = (st.st_mtime_ns, st.st_size, tomli.load(f))
+        _TOML_CACHE[path] = cached
+    return copy.deepcopy(cached[2])
+
+
+def _deep_merge_inplace(dst: dict, src: dict) -> dict:
+    """Merge `src` into `dst` in place, with `src` taking precedence.
+
+    Values from `src` are stored without copying.
+    """
+    stack = [(dst, src)]
+    while stack:
+        d, s = stack.pop()
+        for key, value in s.items():
+            current = d.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                stack.append((current, value))
+            else:
+                d[key] = value
+    return dst
 
 
 def parse_dot_config(cli_args: list[str]) -> dict:
@@ -33,22 +79,18 @@ def parse_dot_config(cli_args: list[str]) -> dict:
         keys = key_path.split(".")
         current = result
         for key in keys[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
+            current = current.setdefault(key, {})
         # Convert value to appropriate type (e.g., boolean, int, float, or string)
-        if value.lower() == "true":
-            value = True
-        elif value.lower() == "false":
-            value = False
-        else:
-            try:
-                value = int(value)
-            except ValueError:
-                try:
-                    value = float(value)
-                except ValueError:
-                    pass  # Keep as string
+        boolean = _BOOL_MAP.get(value.lower())
+        if boolean is not None:
+            value = boolean
+        elif value.isdecimal() or (value[:1] in _SIGNS and value[1:].isdecimal()):
+            # Plain integers, without the cost of the regex.
+            value = int(value)
+        elif _INT_RE.fullmatch(value):
+            value = int(value)
+        elif _FLOAT_RE.fullmatch(value):
+            value = float(value)
         current[keys[-1]] = value
     return result
 
@@ -80,6 +122,7 @@ class TomlConfigParser:
         for group in self.known_groups:
             group.parse_args()
         self.parsed.update(self.parsed.pop(self.default_group_name))
+        _promote_nested(self.parsed)
         return self.parsed
 
     def add_argument_group(self, name: str, help="", expose_raw=False):
@@ -126,21 +169,42 @@ class TomlConfigParser:
         config = {}
         for path in search_paths:
             if path.exists():
-                with open(path, "rb") as f:
-                    config = deep_merge(config, tomli.load(f))
+                _deep_merge_inplace(config, _load_toml_cached(path))
         if self.override_configs:
-            config = deep_merge(config, self.override_configs)
+            _deep_merge_inplace(config, self.override_configs)
 
         self._raw_data = config
         return config
 
 
+def _split_group_name(name: str) -> tuple[str, ...]:
+    """Split a dotted group name into table keys, honoring quoted segments.
+
+    For example: `model.'gpt-4.1'.params` -> ("model", "gpt-4.1", "params")
+    """
+    groups = []
+    current = []
+    in_quotes = False
+
+    for char in name:
+        if char == '"' or char == "'":
+            in_quotes = not in_quotes
+        elif char == "." and not in_quotes:
+            groups.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    groups.append("".join(current))
+    return tuple(groups)
+
+
 class ArgumentGroup:
     """Helper class for grouping arguments in TOML tables"""
 
     def __init__(self, parent, name, help="", expose_raw=False):
         self.parent = parent
         self.name = name
+        self._group_path = _split_group_name(name)
         self.known_args = {}
         self.help = help
         self.parsed = Config({})
@@ -154,21 +218,7 @@ class ArgumentGroup:
         return self.parsed
 
     def _parse_group(self):
-        groups = []
-        current = []
-        in_quotes = False
-
-        # Parse the group name with support for quoted segments
-        for char in self.name:
-            if char == '"' or char == "'":
-                in_quotes = not in_quotes
-            elif char == "." and not in_quotes:
-                groups.append("".join(current))
-                current = []
-            else:
-                current.append(char)
-        groups.append("".join(current))
-
+        groups = self._group_path
         raw = self.parent._raw_data
 
         for g in groups:
@@ -232,16 +282,38 @@ class ArgumentGroup:
         return config_text
 
 
+def _promote_nested(d: dict):
+    """Replace nested plain dicts in `d` with `Config`, in place."""
+    stack = [d]
+    while stack:
+        current = stack.pop()
+        for key, value in current.items():
+            if isinstance(value, dict):
+                if not isinstance(value, Config):
+                    value = current[key] = Config(value)
+                stack.append(value)
+
+
 class Config(dict):
     """Wrapper class that allows both dot notation and dictionary-style access to fields"""
 
-    def __getattr__(self, name):
-        if name in self:
-            value = self[name]
-            if isinstance(value, dict):
-                return Config(value)
-            return value
-        raise AttributeError(f"'Config' object has no attribute '{name}'")
+    __slots__ = ()
+
+    def __getattribute__(self, name):
+        # Look keys up directly instead of failing the regular lookup first.
+        # Names defined on the class, e.g. dict methods, still take precedence.
+        if name in _CONFIG_ATTRS:
+            return object.__getattribute__(self, name)
+        try:
+            value = dict.__getitem__(self, name)
+        except KeyError:
+            raise AttributeError(f"'Config' object has no attribute '{name}'") from None
+        if isinstance(value, dict) and not isinstance(value, Config):
+            # Not promoted yet, e.g. Config built directly from nested dicts.
+            value = self[name] = Config(value)
+        return value
+
+    __setattr__ = dict.__setitem__
+
 
-    def __setattr__(self, name, value):
-        self[name] = value
+_CONFIG_ATTRS = frozenset(dir(Config))
@@ -1,7 +1,9 @@
 import asyncio
-import inspect
 import logging
+import os
+import re
 from enum import Enum
+from itertools import islice
 from typing import Callable, Iterable, Optional
 
 from kissllm.io import IOChannel, IOTypeEnum
@@ -9,7 +11,17 @@ from prompt_toolkit.completion import Completion
 from prompt_toolkit.history import FileHistory, History
 from textual import events
 from textual.app import App, ComposeResult
-from textual.widgets import Collapsible, Footer, Label, ListItem, ListView, TextArea
+from textual.containers import Container
+from textual.widgets import (
+    Collapsible,
+    Footer,
+    Label,
+    ListItem,
+    ListView,
+    RichLog,
+    Static,
+    TextArea,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +62,11 @@ class TUIByIO(App):
     .wrapped {
         width: 100%;
     }
+    .stream-log {
+        height: auto;
+        overflow-y: hidden;
+        background: transparent;
+    }
     SuggestionPopup {
         background: $panel;
         border: round $accent;
@@ -86,8 +103,10 @@ class TUIByIO(App):
         yield Footer()
 
     def action_collapse_or_expand(self, collapse: bool) -> None:
-        for child in self.walk_children(Collapsible):
-            child.collapsed = collapse
+        with self.batch_update():
+            for child in self.walk_children(Collapsible):
+                if child.collapsed != collapse:
+                    child.collapsed = collapse
 
     def action_disable_follow(self):
         self.follow = False
@@ -106,21 +125,50 @@ class TUIByIO(App):
 
     async def update_and_scroll(self, func, *args, **kwargs):
         result = func(*args, **kwargs)
-        if inspect.isawaitable(result):
+        # Cheaper than inspect.isawaitable, this runs for every streamed redraw.
+        if result is not None and hasattr(type(result), "__await__"):
             return await result
 
         if self.follow:
             self.call_later(self.screen.scroll_end)
 
 
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
 class SuggestionPopup(ListView):
     """A popup widget for displaying suggestions."""
 
     def __init__(self, suggestions: list[Completion], *args, **kwargs):
         self.suggestions = suggestions
+        self.popup_width = self._width_for(suggestions)
         items = [ListItem(Label(suggestion.display_text)) for suggestion in suggestions]
         super().__init__(*items, *args, **kwargs)
 
+    @staticmethod
+    def _width_for(suggestions: list[Completion]) -> int:
+        # Add some padding
+        return max(len(s.display_text) for s in suggestions) + 6
+
+    async def set_suggestions(self, suggestions: list[Completion]):
+        """Replace the entries, relabelling existing items instead of
+        remounting them."""
+        items = list(self.query_children(ListItem))
+        with self.app.batch_update():
+            for item, suggestion in zip(items, suggestions):
+                item.query_one(Label).update(suggestion.display_text)
+            if len(items) > len(suggestions):
+                await self.remove_children(items[len(suggestions) :])
+            elif len(items) < len(suggestions):
+                await self.extend(
+                    ListItem(Label(suggestion.display_text))
+                    for suggestion in suggestions[len(items) :]
+                )
+        self.suggestions = suggestions
+        self.popup_width = self._width_for(suggestions)
+        self.index = 0
+
     def get_selected_suggestion(self) -> Completion:
         if 0 <= self.index < len(self.suggestions):
             return self.suggestions[self.index]
@@ -145,6 +193,20 @@ class UserInput(TextArea):
         ("tab", "on_down", "Accept Suggestion"),
     ]
 
+    # Seconds of typing pause before suggestions are computed.
+    SUGGEST_DEBOUNCE = 0.03
+    # Too many suggestions slows the ui significantly.
+    MAX_SUGGESTIONS = 20
+    # Keys with special meaning while suggestions are shown, mapped to the
+    # method handling them. None leaves the key to the bindings, other
+    # unprintable keys hide the suggestions.
+    _SUGGESTION_KEYS = {
+        "enter": "action_accept_suggestion",
+        "up": None,
+        "down": None,
+        "tab": None,
+    }
+
     def __init__(
         self,
         input_future,
@@ -156,12 +218,34 @@ class UserInput(TextArea):
         super().__init__(*args, **kwargs)
         self.input_future = input_future
         self.submit_history = history
+        # Loaded history entries, most recent first.
+        self._history_cache: Optional[list[str]] = None
+        # Lowercased copy of _history_cache for case-insensitive search.
+        self._history_cache_lower: list[str] = []
+        # File signature when _history_cache was loaded, see _history_signature.
+        self._history_loaded_sig = None
+        self._history_lock = asyncio.Lock()
+        # (needle, start index, match index) of the last history search.
+        self._last_history_search: Optional[tuple[str, int, Optional[int]]] = None
+        # Trigram -> ids of the lowercased entries containing it, built on the
+        # first search. Ids count from the oldest entry so they survive inserts
+        # at the front of _history_cache.
+        self._history_trigrams: Optional[dict[str, set[int]]] = None
         self.history_index = -1  # -1 means no history active
         self.history_search_text = ""
         self.history_search_mode = False
         self.suggester = suggester
         self.suggestion_popup: Optional[SuggestionPopup] = None
+        # Display texts of the mounted popup, to reuse it for identical lists.
+        self._last_suggestions_key: Optional[tuple[str, ...]] = None
+        # Inputs of the popup placement last applied, see show_suggestions.
+        self._last_popup_geometry: Optional[tuple] = None
+        # Text before the cursor the visible suggestions were computed for.
+        self._last_suggest_text: Optional[str] = None
         self.suggestions_visible = False
+        # Set when the text changed after the visible suggestions were computed.
+        self._suggestions_stale = False
+        self._suggest_handle: Optional[asyncio.TimerHandle] = None
 
     async def _on_key(self, event: events.Key) -> None:
         continue_super = True
@@ -176,12 +260,22 @@ class UserInput(TextArea):
                 await self.action_history_search()
 
         elif self.suggestions_visible:
-            if event.key == "enter":
+            action = self._SUGGESTION_KEYS.get(event.key, "")
+            if action and self._suggestions_stale:
+                # Entries were computed for earlier text, handle the key as if
+                # no suggestions were shown.
+                await self.action_hide_suggestions()
+            elif action:
                 continue_super = False
                 event.prevent_default()
-                await self.action_accept_suggestion()
-            elif event.key not in ("up", "down", "tab"):
-                await self.action_hide_suggestions()
+                await getattr(self, action)()
+            elif action == "":
+                if event.is_printable:
+                    # Typing keeps the popup until the scheduled update
+                    # refreshes it, its entries don't match the text meanwhile.
+                    self._suggestions_stale = True
+                else:
+                    await self.action_hide_suggestions()
 
         # Textual parses shift+enter this way.
         # One can use [tkrec](https://github.com/Textualize/textual-key-recorder/)
@@ -194,20 +288,96 @@ class UserInput(TextArea):
         if continue_super:
             await super()._on_key(event)
             if event.is_printable and self.suggester:
-                await self.update_suggestions()
+                self._schedule_suggestions()
+
+    def reset(self, input_future):
+        """Prepare the widget for reading another input."""
+        self.input_future = input_future
+        self._cancel_scheduled_suggestions()
+        self.load_text("")
+        self.history_index = -1
+        self.history_search_text = ""
+        self.history_search_mode = False
 
     async def action_submit(self) -> None:
         """Submit the input."""
         user_input = self.text
         await self.action_hide_suggestions()
         if self.submit_history and user_input:
-            self.submit_history.append_string(user_input)
+            # store_string rather than append_string: the in-memory list of
+            # History is never read, _read_history bypasses it.
+            await asyncio.to_thread(self.submit_history.store_string, user_input)
+            if self._history_cache is not None:
+                self._history_cache.insert(0, user_input)
+                self._history_cache_lower.insert(0, user_input.lower())
+                self._last_history_search = None
+                if self._history_trigrams is not None:
+                    entry_id = len(self._history_cache_lower) - 1
+                    for trigram in _trigrams(self._history_cache_lower[0]):
+                        self._history_trigrams.setdefault(trigram, set()).add(entry_id)
+                # Our own write must not invalidate the cache.
+                self._history_loaded_sig = self._history_signature()
         if self.input_future and not self.input_future.done():
             self.input_future.set_result(user_input)
 
-    @property
-    async def loaded_history(self):
-        return [h async for h in self.submit_history.load()]
+    def _history_signature(self):
+        # Only file backed histories can change behind our back.
+        filename = getattr(self.submit_history, "filename", None)
+        if filename is None:
+            return None
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_history(self) -> list[str]:
+        # Read the storage directly, History.load() keeps serving its first
+        # result.
+        return list(self.submit_history.load_history_strings())
+
+    async def _get_history(self) -> list[str]:
+        async with self._history_lock:
+            signature = self._history_signature()
+            if self._history_cache is None or signature != self._history_loaded_sig:
+                self._history_cache = await asyncio.to_thread(self._read_history)
+                self._history_cache_lower = [h.lower() for h in self._history_cache]
+                self._history_loaded_sig = signature
+                self._last_history_search = None
+                self._history_trigrams = None
+        return self._history_cache
+
+    def _find_history(self, needle: str, start: int) -> Optional[int]:
+        """Index of the most recent entry from `start` on containing `needle`."""
+        history_lower = self._history_cache_lower
+        if len(needle) < 3:
+            return next(
+                (
+                    i
+                    for i in range(start, len(history_lower))
+                    if needle in history_lower[i]
+                ),
+                None,
+            )
+
+        if self._history_trigrams is None:
+            self._history_trigrams = {}
+            last_id = len(history_lower) - 1
+            for i, entry in enumerate(history_lower):
+                for trigram in _trigrams(entry):
+                    self._history_trigrams.setdefault(trigram, set()).add(last_id - i)
+
+        id_sets = sorted(
+            (self._history_trigrams.get(t, ()) for t in _trigrams(needle)), key=len
+        )
+        candidates = set(id_sets[0]).intersection(*id_sets[1:])
+        # Larger ids are more recent, i.e. closer to the front.
+        last_id = len(history_lower) - 1
+        for entry_id in sorted(candidates, reverse=True):
+            i = last_id - entry_id
+            if i >= start and needle in history_lower[i]:
+                return i
+        return None
 
     async def action_history_search(self):
         """Search history matching current input."""
@@ -217,21 +387,28 @@ class UserInput(TextArea):
         if not self.history_search_mode:
             self.history_search_mode = True
             self.history_search_text = self.text
-        history = await self.loaded_history
-        for i in range(self.history_index, len(history)):
-            if self.history_search_text.lower() in history[i].lower():
-                self.history_index = i
-                self.text = (
-                    f"(search-history) `{self.history_search_text}`: {history[i]}"
-                )
-                break
+        history = await self._get_history()
+        needle = self.history_search_text.lower()
+        # Start from the most recent entry when no history entry is active.
+        start = max(self.history_index, 0)
+        last = self._last_history_search
+        if last is not None and last[:2] == (needle, start):
+            match = last[2]
+        else:
+            match = self._find_history(needle, start)
+            self._last_history_search = (needle, start, match)
+        if match is not None:
+            self.history_index = match
+            self.text = (
+                f"(search-history) `{self.history_search_text}`: {history[match]}"
+            )
         else:
             self.text = f"(search-history) `{self.history_search_text}`: {history[self.history_index]}"
 
     async def history_search_exit(self, find=True):
         if self.history_search_mode:
             self.text = (
-                (await self.loaded_history)[self.history_index]
+                (await self._get_history())[self.history_index]
                 if find
                 else self.history_search_text
             )
@@ -240,6 +417,7 @@ class UserInput(TextArea):
 
     async def action_on_abort(self):
         """Reset history navigation state."""
+        self._cancel_scheduled_suggestions()
         if self.suggestions_visible and self.suggestion_popup:
             await self.action_hide_suggestions()
             return
@@ -256,8 +434,10 @@ class UserInput(TextArea):
 
         if not self.submit_history:
             return
+        # The text is about to be replaced by a history entry.
+        self._cancel_scheduled_suggestions()
         await self.history_search_exit()
-        history = await self.loaded_history
+        history = await self._get_history()
         if self.history_index < len(history) - 1:
             self.history_index += 1
             self.text = history[self.history_index]
@@ -270,8 +450,10 @@ class UserInput(TextArea):
 
         if not self.submit_history:
             return
+        # The text is about to be replaced by a history entry.
+        self._cancel_scheduled_suggestions()
         await self.history_search_exit()
-        history = await self.loaded_history
+        history = await self._get_history()
         if self.history_index > 0:
             self.history_index -= 1
             self.text = history[self.history_index]
@@ -279,12 +461,33 @@ class UserInput(TextArea):
             self.history_index = -1
             self.text = self.history_search_text
 
+    def _schedule_suggestions(self):
+        """Update suggestions once typing pauses, dropping superseded requests."""
+        self._cancel_scheduled_suggestions()
+        # call_later on the widget runs the update in its message queue, so it
+        # never interleaves with key handling.
+        self._suggest_handle = asyncio.get_running_loop().call_later(
+            self.SUGGEST_DEBOUNCE, self.call_later, self.update_suggestions
+        )
+
+    def _cancel_scheduled_suggestions(self):
+        if self._suggest_handle is not None:
+            self._suggest_handle.cancel()
+            self._suggest_handle = None
+
     async def update_suggestions(self):
         """Update suggestions based on current text."""
         if not self.suggester:
             return
 
-        suggestions = list(self.suggester(self))
+        # Suggesters complete the text before the cursor.
+        before_cursor = self.document.get_text_range((0, 0), self.cursor_location)
+        if self.suggestions_visible and before_cursor == self._last_suggest_text:
+            self._suggestions_stale = False
+            return
+        self._last_suggest_text = before_cursor
+
+        suggestions = list(islice(self.suggester(self), self.MAX_SUGGESTIONS))
 
         if suggestions:
             await self.show_suggestions(suggestions)
@@ -293,52 +496,75 @@ class UserInput(TextArea):
 
     async def show_suggestions(self, suggestions: list[Completion]):
         """Show the suggestion popup with given suggestions."""
-        await self.action_hide_suggestions()  # Hide any existing popup
-
         if not suggestions:
+            await self.action_hide_suggestions()
             return
 
-        # Too many suggestions slows the ui significantly.
-        self.suggestion_popup = SuggestionPopup(suggestions[:20])
+        key = tuple(s.display_text for s in suggestions)
+        if self.suggestion_popup is None:
+            self.suggestion_popup = SuggestionPopup(suggestions)
+        elif key == self._last_suggestions_key:
+            # Same entries, only their start positions may have moved.
+            self.suggestion_popup.suggestions = suggestions
+        else:
+            await self.suggestion_popup.set_suggestions(suggestions)
+        self._last_suggestions_key = key
 
         # Position popup intelligently
         cursor_offset = self.cursor_screen_offset
         # Get the size of the terminal
         terminal_size = self.app.size
-        popup_width = (
-            max(len(s.display_text) for s in suggestions) + 6
-        )  # Add some padding
+        popup_width = self.suggestion_popup.popup_width
         popup_height = min(len(suggestions), 10) + 2  # Limit height to 10 items
-
-        # Calculate x position (prevent right overflow)
         matched_len = suggestions[0].start_position if suggestions else 0
-        x_pos = min(cursor_offset[0] + matched_len, terminal_size.width - popup_width)
 
-        # Calculate y position (flip to above if below is not enough space)
-        if cursor_offset[1] + popup_height <= terminal_size.height:
-            # Place below cursor
-            y_pos = cursor_offset[1]
-        else:
-            # Place above cursor
-            y_pos = cursor_offset[1] - popup_height
+        geometry = (
+            cursor_offset,
+            terminal_size,
+            popup_width,
+            popup_height,
+            matched_len,
+        )
+        if geometry != self._last_popup_geometry:
+            self._last_popup_geometry = geometry
+
+            # Calculate x position (prevent right overflow)
+            x_pos = min(
+                cursor_offset[0] + matched_len, terminal_size.width - popup_width
+            )
 
-        popup_offset = (x_pos, y_pos)
-        self.suggestion_popup.styles.offset = popup_offset
-        self.suggestion_popup.styles.width = popup_width
+            # Calculate y position (flip to above if below is not enough space)
+            if cursor_offset[1] + popup_height <= terminal_size.height:
+                # Place below cursor
+                y_pos = cursor_offset[1]
+            else:
+                # Place above cursor
+                y_pos = cursor_offset[1] - popup_height
+
+            popup_offset = (x_pos, y_pos)
+            self.suggestion_popup.styles.offset = popup_offset
+            self.suggestion_popup.styles.width = popup_width
 
-        await self.app.mount(self.suggestion_popup)
+        if not self.suggestion_popup.is_mounted:
+            await self.app.mount(self.suggestion_popup)
         self.suggestions_visible = True
+        self._suggestions_stale = False
 
     async def action_hide_suggestions(self):
         """Hide the suggestion popup."""
+        self._cancel_scheduled_suggestions()
         if self.suggestion_popup:
             await self.suggestion_popup.remove()
             self.suggestion_popup = None
+            self._last_suggestions_key = None
+            self._last_popup_geometry = None
+        self._last_suggest_text = None
         self.suggestions_visible = False
+        self._suggestions_stale = False
 
     async def action_accept_suggestion(self):
         """Accept the selected suggestion."""
-        if self.suggestion_popup:
+        if self.suggestion_popup and not self._suggestions_stale:
             suggestion = self.suggestion_popup.get_selected_suggestion()
             if suggestion:
                 cl = self.cursor_location
@@ -357,120 +583,172 @@ class CollapsibleLabel(Collapsible):
         self.label_widget.update(content)
 
 
+class CollapsibleLog(Collapsible):
+    """Collapsible for streamed text.
+
+    Completed lines are appended to a log and never rendered again, only the
+    unfinished last line is re-rendered on each append.
+    """
+
+    def __init__(self, title="", collapsed=True):
+        self.log_widget = RichLog(
+            wrap=True, markup=False, min_width=1, classes="stream-log"
+        )
+        self.tail_widget = Label("", markup=False, classes="wrapped")
+        self._tail = ""
+        super().__init__(
+            self.log_widget, self.tail_widget, title=title, collapsed=collapsed
+        )
+
+    def append(self, text):
+        lines = (self._tail + text).split("\n")
+        self._tail = lines.pop()
+        for line in lines:
+            self.log_widget.write(line)
+        self.tail_widget.update(self._tail)
+
+
+_CHANNEL_TYPE_TITLES: dict = {}
+
+
+def _channel_type_title(channel_type) -> str:
+    title = _CHANNEL_TYPE_TITLES.get(channel_type)
+    if title is None:
+        title = _CHANNEL_TYPE_TITLES[channel_type] = (
+            str(channel_type.value)
+            if isinstance(channel_type, Enum)
+            else str(channel_type)
+        )
+    return title
+
+
 class TextualIOChannel(IOChannel):
     def __init__(self, app, channel_type, title=""):
         self.app = app
         self.output_widget = None
         self.channel_type = channel_type
         self.title = title
+        self._history = FileHistory(f".arox.{self.title}.history")
+        # Created on the first read and kept for later turns.
+        self._input_container = None
+        self._input_widget: Optional[UserInput] = None
 
     async def read(self):
         while True:
             input_future = asyncio.get_running_loop().create_future()
-            from textual.containers import Container
-            from textual.widgets import Static
-
-            prompt_label = Static(f"{self.title} > ", classes="prompt-label")
-
-            input_widget = UserInput(
-                input_future,
-                history=FileHistory(f".arox.{self.title}.history"),
-                suggester=self.app.input_suggester,
-            )
+            input_container = self._input_container
+            if input_container is None:
+                prompt_label = Static(f"{self.title} > ", classes="prompt-label")
+
+                self._input_widget = UserInput(
+                    input_future,
+                    history=self._history,
+                    suggester=self.app.input_suggester,
+                )
 
-            input_container = Container(
-                prompt_label, input_widget, classes="input-container"
-            )
+                input_container = self._input_container = Container(
+                    prompt_label, self._input_widget, classes="input-container"
+                )
 
-            await self.app.mount(input_container)
-            input_widget.focus()
+                await self.app.mount(input_container)
+            else:
+                # Reuse the input from the previous turn, moved below the output
+                # mounted since then.
+                self._input_widget.reset(input_future)
+                screen = input_container.parent
+                if screen.children[-1] is not input_container:
+                    screen.move_child(input_container, after=screen.children[-1])
+                input_container.display = True
+
+            self._input_widget.focus()
             user_input = await input_future
-            await input_container.remove()
 
             collapsible = Collapsible(
                 Label(user_input, markup=False, classes="wrapped"),
                 collapsed=False,
                 title=f"{self.title}.User",
             )
-            await self.app.update_and_scroll(self.app.mount, collapsible)
+            # Hide the input and show its echo in a single repaint.
+            with self.app.batch_update():
+                input_container.display = False
+                await self.app.update_and_scroll(self.app.mount, collapsible)
             yield user_input
 
     async def write(self, content, metadata=None):
+        if content is None or content == "":
+            return
         output_content = f"{self.title}: {str(content)}"
         output_widget = Label(output_content)
         await self.app.update_and_scroll(self.app.mount, output_widget)
 
     def create_sub_channel(self, channel_type, title=""):
         if not title:
-            title = (
-                str(channel_type.value)
-                if isinstance(channel_type, Enum)
-                else str(channel_type)
-            )
-            title = f"{self.title}.{title}"
-        if channel_type == IOTypeEnum.prompt_message:
-            return PromptMessageWidget(self.app, channel_type, title)
-        elif channel_type == IOTypeEnum.streaming_assistant:
-            return StreamingOutputWidget(self.app, channel_type, title)
+            title = f"{self.title}.{_channel_type_title(channel_type)}"
+        cls = _SUB_CHANNEL_MAP.get(channel_type, self.__class__)
+        return cls(self.app, channel_type, title)
 
-        return self.__class__(self.app, channel_type, title)
 
+_XML_TAG_RE = re.compile(r"^<(\w+)([^>]*)>(.*?)</\1>", re.DOTALL | re.MULTILINE)
+# content -> sections of the last _xml_sections call. A single entry, since
+# prompts embed whole files.
+_XML_SECTIONS_CACHE: dict[str, tuple] = {}
 
-def _process_xml_tags(content_str, title, app):
-    """Process content with XML tags and return appropriate widget."""
-    import re
 
-    # Regular expression to match XML-style tags
-    xml_tag_pattern = r"^<(\w+)([^>]*)>(.*?)</\1>"
+def _xml_sections(content_str):
+    """Split content into (title suffix, text) sections around XML tags.
 
-    # Find all XML tags and their content
-    matches = list(re.finditer(xml_tag_pattern, content_str, re.DOTALL | re.MULTILINE))
+    Returns an empty tuple if there is no tag. The result for the last content
+    is kept, the same prompt is often shown again.
+    """
+    cached = _XML_SECTIONS_CACHE.get(content_str)
+    if cached is None:
+        cached = _scan_xml_sections(content_str)
+        _XML_SECTIONS_CACHE.clear()
+        _XML_SECTIONS_CACHE[content_str] = cached
+    return cached
 
-    if matches:
-        # Process content with XML tags
-        sub_widgets = []
-
-        # Add content before the first tag if it exists
-        last_end = 0
-        for match in matches:
-            # Add content before this tag if it's not empty
-            pre_content = content_str[last_end : match.start()].strip()
-            if pre_content:
-                output_widget = CollapsibleLabel(
-                    pre_content,
-                    title=f"{title}.text",
-                    collapsed=True,
-                )
-                sub_widgets.append(output_widget)
-
-            # Extract tag name and content
-            tag_name = match.group(1)
-            tag_attrs = match.group(2).strip()
-            tag_content = match.group(3).strip()
-
-            # Create a title for the collapsible section
-            widget_title = f"{title}.{tag_name}"
-            if tag_attrs:
-                widget_title += f" {tag_attrs}"
-
-            output_widget = CollapsibleLabel(
-                tag_content,
-                title=widget_title,
-                collapsed=True,
-            )
-            sub_widgets.append(output_widget)
 
-            last_end = match.end()
+def _scan_xml_sections(content_str):
+    sections = []
+    last_end = 0
+    for match in _XML_TAG_RE.finditer(content_str):
+        # Add content before this tag if it's not empty
+        pre_content = content_str[last_end : match.start()].strip()
+        if pre_content:
+            sections.append(("text", pre_content))
 
-        # Add remaining content after the last tag if it exists
-        remaining_content = content_str[last_end:].strip()
-        if remaining_content:
-            output_widget = CollapsibleLabel(
-                remaining_content,
-                title=f"{title}.text",
-                collapsed=True,
-            )
-            sub_widgets.append(output_widget)
+        # Extract tag name and content
+        tag_name = match.group(1)
+        tag_attrs = match.group(2).strip()
+        tag_content = match.group(3).strip()
+
+        # Create a title for the collapsible section
+        if tag_attrs:
+            tag_name += f" {tag_attrs}"
+        sections.append((tag_name, tag_content))
+
+        last_end = match.end()
+
+    if not sections:
+        return ()
+
+    # Add remaining content after the last tag if it exists
+    remaining_content = content_str[last_end:].strip()
+    if remaining_content:
+        sections.append(("text", remaining_content))
+    return tuple(sections)
+
+
+def _process_xml_tags(content_str, title, app):
+    """Process content with XML tags and return appropriate widget."""
+    sections = _xml_sections(content_str)
+
+    if sections:
+        # Process content with XML tags
+        sub_widgets = [
+            CollapsibleLabel(text, title=f"{title}.{suffix}", collapsed=True)
+            for suffix, text in sections
+        ]
 
         main_collapsible = Collapsible(
             *sub_widgets,
@@ -514,30 +792,67 @@ class StreamingOutputWidget(IOChannel):
         self.app = app
         self.output_widget = None
         self.title = title
-        self.accumulated_content = ""
+        # Streamed chunks, joined only when the content is rendered.
+        self._chunks: list[str] = []
+        self._joined_cache: str | None = None
+        # Redraws are throttled to about 30 per second while streaming.
+        self._flush_interval = 0.033
+        self._flush_timer = None
+        # Number of chunks already passed to the output widget.
+        self._flushed = 0
 
-    async def write(self, content_generator, metadata=None):
-        if self.output_widget is None:
-            self.output_widget = CollapsibleLabel(title=self.title, collapsed=False)
-            await self.app.update_and_scroll(self.app.mount, self.output_widget)
-            self.output_widget.focus()
+    @property
+    def accumulated_content(self) -> str:
+        if self._joined_cache is None:
+            self._joined_cache = "".join(self._chunks)
+        return self._joined_cache
 
+    async def write(self, content_generator, metadata=None):
         async for content in content_generator:
             if content:
-                self.accumulated_content += str(content)
-
-            await self.app.update_and_scroll(
-                self.output_widget.update, self.accumulated_content
-            )
+                if self.output_widget is None:
+                    # Mounted on the first content, empty chunks alone show
+                    # nothing until the stream ends.
+                    self.output_widget = CollapsibleLog(
+                        title=self.title, collapsed=False
+                    )
+                    await self.app.update_and_scroll(self.app.mount, self.output_widget)
+                    self.output_widget.focus()
+                self._chunks.append(str(content))
+                self._joined_cache = None
+                if self._flush_timer is None:
+                    self._flush_timer = self.app.set_timer(
+                        self._flush_interval, self._flush
+                    )
+
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+            self._flush_timer = None
 
         # Process content with XML tags and get appropriate widget
         widget = _process_xml_tags(self.accumulated_content, self.title, self.app)
 
-        # If we already have an output widget, remove it before adding the new one
-        if self.output_widget:
-            await self.output_widget.remove()
+        # Swap widgets in one batch so no frame shows neither of them.
+        with self.app.batch_update():
+            # If we already have an output widget, remove it before adding the new one
+            if self.output_widget:
+                await self.output_widget.remove()
 
-        # Update the output widget reference and mount
-        self.output_widget = widget
-        await self.app.update_and_scroll(self.app.mount, self.output_widget)
+            # Update the output widget reference and mount
+            self.output_widget = widget
+            await self.app.update_and_scroll(self.app.mount, self.output_widget)
         self.output_widget.focus()
+
+    async def _flush(self):
+        self._flush_timer = None
+        pending = "".join(self._chunks[self._flushed :])
+        self._flushed = len(self._chunks)
+        # Appending may write several log lines besides the tail label.
+        with self.app.batch_update():
+            await self.app.update_and_scroll(self.output_widget.append, pending)
+
+
+_SUB_CHANNEL_MAP = {
+    IOTypeEnum.prompt_message: PromptMessageWidget,
+    IOTypeEnum.streaming_assistant: StreamingOutputWidget,
+}
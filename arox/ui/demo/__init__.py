@@ -1,10 +1,16 @@
 import argparse
+import asyncio
 import os
 
 import yaml
 
 from arox.ui import TUIByIO
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 class DemoTUI(TUIByIO):
     def __init__(self, app_name, skip_read=True):
@@ -17,19 +23,27 @@ class DemoTUI(TUIByIO):
 
 
 class IOGenerator:
+    # Parsed action files by path, shared by all generators in the process.
+    _actions_cache: dict[str, list] = {}
+    # Number of actions run before yielding to the event loop.
+    YIELD_EVERY = 8
+
     def __init__(self, io_channel, skip_read=True):
         self.io_channel = io_channel
         self.skip_read = skip_read
 
     async def stream_content(self, content, interval):
-        import asyncio
-
+        # Slicing the str steps by code points, so multi-byte characters are
+        # never split.
         for i in range(0, len(content), 2):
             yield content[i : i + 2]
             await asyncio.sleep(interval)
 
     async def do_action(self, io_channel, io_actions):
-        for io_action in io_actions:
+        for i, io_action in enumerate(io_actions, 1):
+            if i % self.YIELD_EVERY == 0:
+                # Let the UI paint between batches of actions.
+                await asyncio.sleep(0)
             if io_action["action"] == "read":
                 if not self.skip_read:
                     async for _ in io_channel.read():
@@ -46,15 +60,23 @@ class IOGenerator:
                 sub_channel = io_channel.create_sub_channel(
                     io_action["type"], io_action.get("title")
                 )
+                await asyncio.sleep(0)
                 await self.do_action(sub_channel, io_action["actions"])
 
+    @classmethod
+    def load_actions(cls, file_path):
+        io_actions = cls._actions_cache.get(file_path)
+        if io_actions is None:
+            with open(file_path, "r", encoding="utf-8") as file:
+                io_actions = yaml.load(file, Loader=_YamlLoader)
+            cls._actions_cache[file_path] = io_actions
+        return io_actions
+
     async def run(self):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         file_path = os.path.join(current_dir, "io_example.yaml")
 
-        with open(file_path, "r", encoding="utf-8") as file:
-            io_actions = yaml.safe_load(file)
-            await self.do_action(self.io_channel, io_actions)
+        await self.do_action(self.io_channel, self.load_actions(file_path))
 
 
 def main():
@@ -63,6 +63,53 @@ def xml_wrap(contents: list[tuple[str, str]]) -> str:
     return "\n".join(xmled)
 
 
+async def coalesce_chunks(source, max_chunks=16, interval=0.01):
+    """Re-yield string chunks from an async iterator joined into batches.
+
+    A batch is emitted once it holds `max_chunks` chunks or `interval` seconds
+    after its first chunk arrived, whichever comes first.
+    """
+    import asyncio
+
+    queue = asyncio.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for chunk in source:
+                await queue.put(chunk)
+        finally:
+            await queue.put(done)
+
+    task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is done:
+                break
+            batch = [item]
+            deadline = loop.time() + interval
+            while len(batch) < max_chunks:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is done:
+                    finished = True
+                    break
+                batch.append(item)
+            yield "".join(batch)
+        # Surface errors raised by the source.
+        await task
+    finally:
+        task.cancel()
+
+
 async def run_command(command: str) -> tuple[str, str, int]:
     """
     Run a shell command asynchronously.
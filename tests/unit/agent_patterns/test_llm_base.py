@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from arox.agent_patterns.llm_base import LLMBaseAgent
+
+
+@pytest.fixture
+def agent():
+    # Hooks need no configured agent.
+    return object.__new__(LLMBaseAgent)
+
+
+def recording_hook(name, log, fail=False, delay=0.01):
+    async def hook(agent, input_content):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(name)
+        log.append(("end", name))
+
+    return hook
+
+
+@pytest.mark.asyncio
+async def test_sequential_hooks_are_barriers(agent):
+    log = []
+    agent.add_before_step_hook(recording_hook("c1", log))
+    agent.add_before_step_hook(recording_hook("c2", log))
+    agent.add_before_step_hook(recording_hook("s", log), sequential=True)
+    agent.add_before_step_hook(recording_hook("c3", log))
+    agent.add_before_step_hook(recording_hook("c4", log))
+
+    await agent._run_before_hooks("input")
+
+    pos = {event: i for i, event in enumerate(log)}
+    assert len(pos) == 10
+    # Concurrent hooks overlap.
+    assert pos["start", "c2"] < pos["end", "c1"]
+    assert pos["start", "c4"] < pos["end", "c3"]
+    # The sequential hook waits for earlier hooks and blocks later ones.
+    assert max(pos["end", "c1"], pos["end", "c2"]) < pos["start", "s"]
+    assert pos["end", "s"] < min(pos["start", "c3"], pos["start", "c4"])
+
+
+@pytest.mark.asyncio
+async def test_failing_concurrent_hook_does_not_stop_others(agent):
+    log = []
+    agent.add_after_step_hook(recording_hook("fail", log, fail=True))
+    agent.add_after_step_hook(recording_hook("slow", log, delay=0.03))
+    agent.add_after_step_hook(recording_hook("s", log), sequential=True)
+
+    with pytest.raises(RuntimeError, match="fail"):
+        await agent._run_after_hooks("input")
+    assert ("end", "slow") not in log
+    await asyncio.sleep(0.05)
+
+    assert ("end", "slow") in log
+    assert ("start", "s") not in log
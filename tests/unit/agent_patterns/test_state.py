@@ -0,0 +1,161 @@
+import re
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from arox.agent_patterns.state import ChatFiles, SimpleState
+
+
+@pytest.fixture
+def chat_files(tmp_path):
+    agent = MagicMock()
+    agent.io_channel.write = AsyncMock()
+    return ChatFiles(agent, tmp_path)
+
+
+@pytest.fixture
+def state(tmp_path):
+    agent = MagicMock()
+    agent.system_prompt = ""
+    agent.workspace = tmp_path
+    return SimpleState(agent)
+
+
+@pytest.mark.asyncio
+async def test_read_files_order_and_missing(chat_files, tmp_path):
+    (tmp_path / "a.txt").write_text("AAA")
+    (tmp_path / "b.txt").write_text("BBB")
+    chat_files.add(Path("a.txt"))
+    chat_files.add(Path("missing.txt"))
+    chat_files.add(Path("b.txt"))
+
+    content, fpaths = await chat_files.read_files()
+
+    assert fpaths == [Path("a.txt"), Path("b.txt")]
+    assert content == "\n====FILE: b.txt====\nBBB\n\n\n====FILE: a.txt====\nAAA\n\n"
+    chat_files.agent.io_channel.write.assert_awaited_once()
+    assert not chat_files.have_pending()
+
+
+@pytest.mark.asyncio
+async def test_read_files_empty(chat_files):
+    assert await chat_files.read_files() == ("", [])
+
+
+@pytest.mark.asyncio
+async def test_read_files_reuses_unchanged_content(chat_files, tmp_path, monkeypatch):
+    f = tmp_path / "a.txt"
+    f.write_text("AAA")
+    chat_files.add(Path("a.txt"))
+    first, _ = await chat_files.read_files()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file should not be re-read")
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "read_text", fail)
+        assert (await chat_files.read_files())[0] == first
+
+    f.write_text("CHANGED")
+    content, _ = await chat_files.read_files()
+    assert "CHANGED" in content
+
+
+@pytest.mark.asyncio
+async def test_unchanged_files_reuse_wrapped_blob(state, tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("AAA")
+    state.chat_files.add(Path("a.txt"))
+
+    await state.add_user_input("one")
+    first = state._files_xml[1]
+    await state.add_user_input("two")
+    assert state._files_xml[1] is first
+
+    f.write_text("CHANGED")
+    await state.add_user_input("three")
+    assert "CHANGED" in state._files_xml[1]
+    files = [
+        m for m in state._messages if m.get("local_metadata", {}).get("type") == "files"
+    ]
+    assert [m["content"] for m in files] == [state._files_xml[1]]
+
+
+def test_append_with_typ_meta(state):
+    messages = state._messages
+    state._append_with_typ_meta(messages, "files", "v1")
+    messages.append({"role": "user", "content": "hi"})
+
+    # Same content keeps the existing message in place.
+    state._append_with_typ_meta(messages, "files", "v1")
+    assert [m["content"] for m in messages] == ["v1", "hi"]
+
+    state._append_with_typ_meta(messages, "files", "v2")
+    assert [m["content"] for m in messages] == ["hi", "v2"]
+
+    state._append_with_typ_meta(messages, "files", "")
+    assert [m["content"] for m in messages] == ["hi"]
+
+
+@pytest.mark.asyncio
+async def test_model_prompt_follows_each_user_input(state):
+    state.agent.model_ref = "openai/gpt-4"
+    state.agent.model_prompt = [
+        {
+            "pattern": "gpt",
+            "plain": True,
+            "compiled": re.compile("gpt"),
+            "prompt": "MODEL RULES",
+        }
+    ]
+
+    await state.add_user_input("user1")
+    state._messages.append({"role": "assistant", "content": "a1"})
+    await state.add_user_input("user2")
+
+    contents = [m["content"] for m in state._messages]
+    assert contents.count("MODEL RULES") == 1
+    assert contents[-1] == "MODEL RULES"
+    assert "user2" in contents[-2]
+    assert contents.index("a1") < contents.index("MODEL RULES")
+
+
+@pytest.mark.asyncio
+async def test_add_remove_dedup(chat_files):
+    chat_files.add(Path("a.txt"))
+    chat_files.add(Path("b.txt"))
+    chat_files.add(Path("a.txt"))
+    assert chat_files.list() == [Path("a.txt"), Path("b.txt")]
+    assert chat_files.have_pending()
+
+    await chat_files.remove(Path("a.txt"))
+    assert chat_files.list() == [Path("b.txt")]
+    chat_files.agent.io_channel.write.assert_not_awaited()
+
+    await chat_files.remove(Path("a.txt"))
+    chat_files.agent.io_channel.write.assert_awaited_once()
+
+    chat_files.clear()
+    assert chat_files.list() == []
+    assert not chat_files.have_pending()
+
+
+def test_append_with_typ_meta_after_external_insert(state):
+    messages = state._messages
+    state._append_with_typ_meta(messages, "files", "v1")
+    state._append_with_typ_meta(messages, "model_prompt", "mp")
+    messages.insert(0, {"role": "user", "content": "tools"})
+
+    state._append_with_typ_meta(messages, "files", "v2")
+    state._append_with_typ_meta(messages, "model_prompt", "mp2")
+    assert [m["content"] for m in messages] == ["tools", "v2", "mp2"]
+
+
+def test_normalize(chat_files, tmp_path):
+    assert chat_files.normalize("a/b.txt") == Path("a/b.txt")
+    assert chat_files.normalize("./a/../b.txt") == Path("b.txt")
+    assert chat_files.normalize(str(tmp_path / "c.txt")) == Path("c.txt")
+    assert chat_files.normalize(str(tmp_path)) == Path(".")
+    assert chat_files.normalize("/etc/hosts") == Path("/etc/hosts")
+    assert chat_files.normalize("../x.txt") == tmp_path.parent / "x.txt"
@@ -0,0 +1,67 @@
+import os
+
+import git
+import pytest
+
+from arox.codebase.project import ProjectManager
+
+
+def test_get_tracked_files_cached_until_index_changes(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "b.py").write_text("b")
+    (tmp_path / "a.py").write_text("a")
+    repo.index.add(["b.py", "a.py"])
+    repo.index.write()
+
+    pm = ProjectManager(tmp_path, None)
+    files = pm.get_tracked_files()
+    assert files == ("a.py", "b.py")
+    assert pm.get_tracked_files() is files
+
+    (tmp_path / "c.py").write_text("c")
+    repo.git.add("c.py")
+    assert pm.get_tracked_files() == ("a.py", "b.py", "c.py")
+
+
+def test_get_tracked_files_non_utf8_name(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    name = os.fsdecode(b"caf\xe9.txt")
+    (tmp_path / name).write_text("x")
+    repo.git.add("--all")
+
+    pm = ProjectManager(tmp_path, None)
+    files = pm.get_tracked_files()
+    assert files == (name,)
+    assert (tmp_path / files[0]).read_text() == "x"
+
+
+def test_get_tracked_files_not_a_repo(tmp_path):
+    pm = ProjectManager(tmp_path, None)
+    assert pm.get_tracked_files() == ()
+
+
+def test_version_bumps_on_recompute(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "a.py").write_text("a")
+    repo.git.add("a.py")
+
+    pm = ProjectManager(tmp_path, None)
+    pm.get_tracked_files()
+    version = pm.version
+    pm.get_tracked_files()
+    assert pm.version == version
+
+    (tmp_path / "b.py").write_text("b")
+    repo.git.add("b.py")
+    pm.get_tracked_files()
+    assert pm.version == version + 1
+
+
+@pytest.mark.asyncio
+async def test_get_tracked_files_async(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "a.py").write_text("a")
+    repo.git.add("a.py")
+
+    pm = ProjectManager(tmp_path, None)
+    assert await pm.get_tracked_files_async() == ("a.py",)
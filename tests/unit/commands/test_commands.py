@@ -0,0 +1,59 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from arox.commands import FileCommand, InvokeToolCommand, parse_cmdline
+
+
+def test_parse_cmdline():
+    assert parse_cmdline("/add") == ("add", None)
+    assert parse_cmdline("/add ") == ("add", "")
+    assert parse_cmdline("/add a.py b.py") == ("add", "a.py b.py")
+    assert parse_cmdline("add") == (None, None)
+
+
+def test_file_command_completes_by_substring():
+    agent = MagicMock()
+    agent.state.chat_files.candidates.return_value = (
+        "arox/state.py",
+        "state.md",
+        "tests/test_state.py",
+    )
+    agent.state.chat_files.list.return_value = [Path("arox/state.py")]
+    command = FileCommand(agent)
+
+    def texts(name, args):
+        return [c.text for c in command.get_completions(name, args)]
+
+    assert texts("add", "a.py sta") == [
+        "arox/state.py",
+        "state.md",
+        "tests/test_state.py",
+    ]
+    assert texts("add", "tests/") == ["tests/test_state.py"]
+    assert texts("drop", "state") == ["arox/state.py"]
+    assert texts("drop", "state.md") == []
+
+
+@pytest.mark.asyncio
+async def test_invoke_tool_passes_json_args():
+    agent = MagicMock()
+    agent.io_channel.write = AsyncMock()
+    agent.tool_registry.execute_tool_call = AsyncMock(return_value="ok")
+
+    await InvokeToolCommand(agent).execute("invoke-tool", 'read {"path": "a.py"}')
+
+    call = agent.tool_registry.execute_tool_call.await_args.args[0]
+    assert call["function"] == {"name": "read", "arguments": '{"path": "a.py"}'}
+
+
+@pytest.mark.asyncio
+async def test_invoke_tool_without_args_shows_usage():
+    agent = MagicMock()
+    agent.io_channel.write = AsyncMock()
+
+    await InvokeToolCommand(agent).execute("invoke-tool", None)
+
+    agent.io_channel.write.assert_awaited_once()
+    assert "Usage" in agent.io_channel.write.await_args.args[0]
@@ -0,0 +1,11 @@
+from arox.commands._trie import Trie
+
+
+def test_trie_prefix_iter():
+    trie = Trie()
+    for key in ["drop", "add", "addon", "model"]:
+        trie.insert(key)
+
+    assert list(trie.prefix_iter("ad")) == ["add", "addon"]
+    assert list(trie.prefix_iter("")) == ["add", "addon", "drop", "model"]
+    assert list(trie.prefix_iter("x")) == []
@@ -1,3 +1,5 @@
+import math
+
 import pytest
 
 from arox.config import ArgumentGroup, Config, TomlConfigParser
@@ -80,6 +82,17 @@ def test_config_missing_attribute():
         _ = config.missing
 
 
+def test_config_keys_do_not_shadow_dict_methods():
+    """Test keys named like dict methods keep the methods reachable"""
+    config = Config({"items": [1, 2], "model": "m"})
+    config.extra = 1
+
+    assert config.model == "m"
+    assert config["extra"] == 1
+    assert callable(config.items)
+    assert config["items"] == [1, 2]
+
+
 def test_argument_group_dump_config():
     """Test generating default config from argument group"""
     group = ArgumentGroup(None, "test")
@@ -127,7 +140,79 @@ def test_parse_dot_config():
         "number": {"int": 123, "float": 1.23},
     }
 
+    args = ["n.neg=-3", "n.exp=1e3", "n.frac=.5", "s.ver=1.2.3", "s.word=abc"]
+    result = parse_dot_config(args)
+    assert result == {
+        "n": {"neg": -3, "exp": 1000.0, "frac": 0.5},
+        "s": {"ver": "1.2.3", "word": "abc"},
+    }
+
+    # Forms accepted by int()/float() and mixed case booleans
+    args = ["b.mixed=TrUe", "b.no=fAlse", "n.under=1_000", "n.spaces= 5 ", "n.inf=inf"]
+    result = parse_dot_config(args)
+    assert result == {
+        "b": {"mixed": True, "no": False},
+        "n": {"under": 1000, "spaces": 5, "inf": float("inf")},
+    }
+    assert math.isnan(parse_dot_config(["n.nan=nan"])["n"]["nan"])
+
+    # Misplaced underscores are rejected by int() and float() as well
+    args = ["s.double=1__0", "s.trailing=1_", "s.exp=1e"]
+    result = parse_dot_config(args)
+    assert result == {"s": {"double": "1__0", "trailing": "1_", "exp": "1e"}}
+
     # Test malformed entries
     args = ["valid.key=value", "invalid_entry", "another.valid=123"]
     result = parse_dot_config(args)
     assert result == {"valid": {"key": "value"}, "another": {"valid": 123}}
+
+
+def test_config_file_cache(tmp_path):
+    """Test parsed config files are reused until they change"""
+    config_file = tmp_path / "test.toml"
+    config_file.write_text("[DEFAULT]\nvalue = 'first'\n[group]\nitem = {a = 1}")
+
+    parser = TomlConfigParser([config_file])
+    parser.add_argument("value")
+    parser.add_argument_group("group", expose_raw=True)
+    config = parser.parse_args()
+    assert config.value == "first"
+
+    # Mutating the result must not leak into the cache.
+    config["group"]["item"]["a"] = 2
+    assert parser.parse_args().group.item.a == 1
+
+    config_file.write_text("[DEFAULT]\nvalue = 'second'\n[group]\nitem = {a = 1}")
+    assert parser.parse_args().value == "second"
+
+
+def test_deep_merge_inplace():
+    from arox.config import _deep_merge_inplace
+
+    dst = {"a": 1, "b": {"c": 2, "d": {"e": 3}}, "f": "str"}
+    src = {"b": {"d": {"e": 4, "g": 5}}, "f": {"h": 6}, "i": 7}
+    result = _deep_merge_inplace(dst, src)
+
+    assert result is dst
+    assert dst == {"a": 1, "b": {"c": 2, "d": {"e": 4, "g": 5}}, "f": {"h": 6}, "i": 7}
+
+
+def test_split_group_name():
+    from arox.config import _split_group_name
+
+    assert _split_group_name("group") == ("group",)
+    assert _split_group_name("model.'gpt-4.1'.params") == ("model", "gpt-4.1", "params")
+    assert _split_group_name('a."b.c"') == ("a", "b.c")
+
+
+def test_config_nested_access_returns_same_object(tmp_path):
+    """Test nested tables are promoted to Config once"""
+    config_file = tmp_path / "test.toml"
+    config_file.write_text("[group.sub]\nvalue = 1")
+
+    parser = TomlConfigParser([config_file])
+    parser.add_argument_group("group", expose_raw=True)
+    config = parser.parse_args()
+
+    assert isinstance(config["group"]["sub"], Config)
+    assert config.group.sub is config.group.sub
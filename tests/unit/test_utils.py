@@ -1,10 +1,17 @@
+import asyncio
 from unittest.mock import patch
 
 import pytest
 from prompt_toolkit.input import create_pipe_input
 from prompt_toolkit.output import DummyOutput
 
-from arox.utils import deep_merge, run_command, user_input_generator
+from arox.utils import (
+    coalesce_chunks,
+    deep_merge,
+    run_command,
+    user_input_generator,
+    xml_wrap,
+)
 
 
 def test_deep_merge_basic():
@@ -77,3 +84,42 @@ async def test_run_command_failure():
         assert stdout == ""
         assert stderr == "error"
         assert returncode == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_batches_by_count():
+    async def source():
+        for i in range(40):
+            yield str(i % 10)
+
+    batches = [b async for b in coalesce_chunks(source(), max_chunks=16)]
+    assert "".join(batches) == "0123456789" * 4
+    assert len(batches) <= 3
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_flushes_after_interval():
+    async def source():
+        yield "a"
+        yield "b"
+        await asyncio.sleep(0.05)
+        yield "c"
+
+    batches = [b async for b in coalesce_chunks(source(), interval=0.01)]
+    assert batches == ["ab", "c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_chunks_propagates_errors():
+    async def source():
+        yield "a"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        async for _ in coalesce_chunks(source()):
+            pass
+
+
+def test_xml_wrap():
+    contents = [("files", "a"), ("empty", None), ("user", "b")]
+    assert xml_wrap(contents) == "<files>\na\n</files>\n\n<user>\nb\n</user>\n"
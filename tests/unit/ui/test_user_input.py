@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+from prompt_toolkit.history import FileHistory
+
+from arox.ui import UserInput
+
+# Oldest first, as they were submitted.
+ENTRIES = ["git status", "ls -la", "git commit -m fix", "echo GIT"]
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    path = tmp_path / "history"
+    history = FileHistory(str(path))
+    for entry in ENTRIES:
+        history.store_string(entry)
+    return path
+
+
+@pytest.fixture
+def user_input(history_path):
+    return UserInput(None, history=FileHistory(str(history_path)))
+
+
+def count_reads(monkeypatch, user_input):
+    reads = []
+    read = user_input._read_history
+
+    def counting_read():
+        reads.append(1)
+        return read()
+
+    monkeypatch.setattr(user_input, "_read_history", counting_read)
+    return reads
+
+
+def naive_find(history, needle, start):
+    return next(
+        (i for i in range(start, len(history)) if needle in history[i].lower()),
+        None,
+    )
+
+
+async def submit(user_input, text):
+    user_input.text = text
+    await user_input.action_submit()
+
+
+@pytest.mark.asyncio
+async def test_find_history(user_input):
+    history = await user_input._get_history()
+    assert history == ENTRIES[::-1]
+
+    assert user_input._find_history("gi", 0) == 0
+    assert user_input._find_history("git", 0) == 0
+    assert user_input._find_history("git c", 0) == 1
+    assert user_input._find_history("git", 2) == 3
+    assert user_input._find_history("git", 4) is None
+    assert user_input._find_history("xyz", 0) is None
+
+    for needle in ["", "g", "-l", "git", "git s", "-m fix", "t c", "nothing"]:
+        for start in range(len(history) + 1):
+            expected = naive_find(history, needle, start)
+            assert user_input._find_history(needle, start) == expected
+
+
+@pytest.mark.asyncio
+async def test_find_history_after_submit(user_input):
+    await user_input._get_history()
+    assert user_input._find_history("git", 1) == 1
+    trigrams = user_input._history_trigrams
+    assert trigrams is not None
+
+    await submit(user_input, "new GIT push")
+
+    # The index is updated in place rather than rebuilt.
+    assert user_input._history_trigrams is trigrams
+    assert user_input._find_history("new", 0) == 0
+    assert user_input._find_history("git", 0) == 0
+    assert user_input._find_history("git", 1) == 1
+    assert user_input._find_history("git c", 0) == 2
+    assert user_input._find_history("ls -", 0) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_history_cached_until_file_changes(
+    user_input, history_path, monkeypatch
+):
+    reads = count_reads(monkeypatch, user_input)
+    history = await user_input._get_history()
+    assert await user_input._get_history() is history
+    assert len(reads) == 1
+
+    # Our own submit updates the cache without reloading it.
+    await submit(user_input, "mine")
+    assert await user_input._get_history() is history
+    assert history[0] == "mine"
+    assert len(reads) == 1
+
+    user_input._find_history("git", 0)
+    user_input._last_history_search = ("git", 0, 1)
+    FileHistory(str(history_path)).store_string("from another session")
+
+    history = await user_input._get_history()
+    assert len(reads) == 2
+    assert history[:2] == ["from another session", "mine"]
+    assert user_input._history_trigrams is None
+    assert user_input._last_history_search is None
+
+
+@pytest.mark.asyncio
+async def test_get_history_reads_once_concurrently(user_input, monkeypatch):
+    reads = count_reads(monkeypatch, user_input)
+    results = await asyncio.gather(*(user_input._get_history() for _ in range(3)))
+    assert len(reads) == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_history_search_reuses_last_search(user_input, monkeypatch):
+    user_input.text = "echo"
+    await user_input.action_history_search()
+    assert user_input._last_history_search == ("echo", 0, 0)
+    assert user_input.text == "(search-history) `echo`: echo GIT"
+
+    def fail(*args):
+        raise AssertionError("repeated search should be memoized")
+
+    monkeypatch.setattr(user_input, "_find_history", fail)
+    await user_input.action_history_search()
+    assert user_input.history_index == 0
+
+    # A submit invalidates the memo.
+    monkeypatch.undo()
+    await user_input.history_search_exit()
+    await submit(user_input, "echo again")
+    assert user_input._last_history_search is None
@@ -0,0 +1,22 @@
+from arox.ui import _XML_SECTIONS_CACHE, _xml_sections
+
+
+def test_xml_sections():
+    content = "intro\n<files>\na\n</files>\n<user attr=1>\nb\n</user>\nend"
+    assert _xml_sections(content) == (
+        ("text", "intro"),
+        ("files", "a"),
+        ("user attr=1", "b"),
+        ("text", "end"),
+    )
+    assert _xml_sections("no tags") == ()
+
+
+def test_xml_sections_keeps_only_last_result():
+    first = _xml_sections("<a>\n1\n</a>")
+    assert _xml_sections("<a>\n1\n</a>") is first
+    assert list(_XML_SECTIONS_CACHE) == ["<a>\n1\n</a>"]
+
+    second = _xml_sections("<b>\n2\n</b>")
+    assert second == (("b", "2"),)
+    assert list(_XML_SECTIONS_CACHE) == ["<b>\n2\n</b>"]